@@ -38,6 +38,7 @@ from browser_utils import (
 import stream
 from asyncio import Queue, Lock
 from . import auth_utils
+from .utils_ext import close_helper_session
 
 # 全局状态变量（这些将在server.py中被引用）
 playwright_manager: Optional[AsyncPlaywright] = None
@@ -196,6 +197,8 @@ async def _shutdown_resources():
         await server.playwright_manager.stop()
         logger.info("Playwright stopped.")
 
+    await close_helper_session()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI application life cycle management"""
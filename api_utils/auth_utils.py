@@ -2,18 +2,24 @@ import os
 from typing import Set
 
 API_KEYS: Set[str] = set()
+# Bumped whenever the loaded key set actually changes, so callers can cache views of it.
+API_KEYS_VERSION: int = 0
 KEY_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "auth_profiles", "key.txt")
 
 def load_api_keys():
     """Loads API keys from the key file into the API_KEYS set."""
-    global API_KEYS
-    API_KEYS.clear()
+    global API_KEYS, API_KEYS_VERSION
+    loaded_keys: Set[str] = set()
     if os.path.exists(KEY_FILE_PATH):
         with open(KEY_FILE_PATH, "r") as f:
             for line in f:
                 key = line.strip()
                 if key:
-                    API_KEYS.add(key)
+                    loaded_keys.add(key)
+    if loaded_keys != API_KEYS:
+        API_KEYS.clear()
+        API_KEYS.update(loaded_keys)
+        API_KEYS_VERSION += 1
 
 def initialize_keys():
     """Initializes API keys. Ensures key.txt exists and loads keys."""
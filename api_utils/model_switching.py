@@ -1,9 +1,20 @@
-from typing import Tuple
+from typing import Any, Dict, FrozenSet, List, Tuple
 from fastapi import HTTPException
 from playwright.async_api import Page as AsyncPage
 
 from .context_types import RequestContext
 
+# 有效模型 ID 集合缓存。parsed_model_list 只会被整体替换，按对象身份判断失效。
+_valid_model_ids_cache: Dict[str, Any] = {"source": None, "ids": frozenset()}
+
+
+def _get_valid_model_ids(parsed_model_list: List[dict]) -> FrozenSet[str]:
+    cache = _valid_model_ids_cache
+    if cache["source"] is not parsed_model_list:
+        cache["ids"] = frozenset(m.get("id") for m in parsed_model_list)
+        cache["source"] = parsed_model_list
+    return cache["ids"]
+
 
 async def analyze_model_requirements(req_id: str, context: RequestContext, requested_model: str, proxy_model_name: str) -> RequestContext:
     logger = context['logger']
@@ -15,10 +26,10 @@ async def analyze_model_requirements(req_id: str, context: RequestContext, reque
         logger.info(f"[{req_id}] 请求使用模型: {requested_model_id}")
 
         if parsed_model_list:
-            valid_model_ids = [m.get("id") for m in parsed_model_list]
-            if requested_model_id not in valid_model_ids:
+            if requested_model_id not in _get_valid_model_ids(parsed_model_list):
                 from .error_utils import bad_request
-                raise bad_request(req_id, f"Invalid model '{requested_model_id}'. Available models: {', '.join(valid_model_ids)}")
+                available_ids = ', '.join(str(m.get("id")) for m in parsed_model_list)
+                raise bad_request(req_id, f"Invalid model '{requested_model_id}'. Available models: {available_ids}")
 
         context['model_id_to_use'] = requested_model_id
         if current_ai_studio_model_id != requested_model_id:
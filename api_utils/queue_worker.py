@@ -7,6 +7,15 @@ import asyncio
 import time
 from fastapi import HTTPException
 from typing import Any, Dict, Optional, Tuple
+from playwright.async_api import expect as expect_async
+
+from config import RESPONSE_COMPLETION_TIMEOUT
+from models import ClientDisconnectedError
+from browser_utils import save_error_snapshot
+from browser_utils.page_controller import PageController
+from .client_connection import test_client_connection as _test_client_connection
+from .request_processor import _process_request_refactored
+from .utils import clear_stream_queue
 from .error_utils import (
     client_disconnected,
     client_cancelled,
@@ -109,7 +118,7 @@ async def queue_worker() -> None:
                         break
 
                 for item in items_to_requeue:
-                    await request_queue.put(item)
+                    request_queue.put_nowait(item)
 
             # 获取下一个请求
             try:
@@ -138,8 +147,6 @@ async def queue_worker() -> None:
             )
 
             # 优化：在开始处理前主动检测客户端连接状态，避免不必要的处理
-            from api_utils.request_processor import _test_client_connection
-
             is_connected = await _test_client_connection(req_id, http_request)
             if not is_connected:
                 logger.info(
@@ -208,8 +215,6 @@ async def queue_worker() -> None:
                 else:
                     # 调用实际的请求处理函数
                     try:
-                        from api_utils import _process_request_refactored
-
                         returned_value = await _process_request_refactored(
                             req_id, request_data, http_request, result_future
                         )
@@ -333,8 +338,6 @@ async def queue_worker() -> None:
                         try:
                             if completion_event:
                                 # 流式模式：等待completion_event
-                                from server import RESPONSE_COMPLETION_TIMEOUT
-
                                 await asyncio.wait_for(
                                     completion_event.wait(),
                                     timeout=RESPONSE_COMPLETION_TIMEOUT / 1000 + 60,
@@ -344,8 +347,6 @@ async def queue_worker() -> None:
                                 )
                             else:
                                 # 非流式模式：等待result_future完成
-                                from server import RESPONSE_COMPLETION_TIMEOUT
-
                                 await asyncio.wait_for(
                                     asyncio.shield(result_future),
                                     timeout=RESPONSE_COMPLETION_TIMEOUT / 1000 + 60,
@@ -370,13 +371,6 @@ async def queue_worker() -> None:
                                 )
                                 wait_timeout_ms = 30000  # 30 seconds
                                 try:
-                                    from playwright.async_api import (
-                                        expect as expect_async,
-                                    )
-                                    from api_utils.request_processor import (
-                                        ClientDisconnectedError,
-                                    )
-
                                     # 检查客户端连接状态
                                     client_disco_checker(
                                         "流式响应后按钮状态检查 - 前置检查: "
@@ -430,10 +424,6 @@ async def queue_worker() -> None:
                                     logger.warning(
                                         f"[{req_id}] ⚠️ 流式响应后按钮状态处理超时或错误: {e_pw_disabled}"
                                     )
-                                    from api_utils.request_processor import (
-                                        save_error_snapshot,
-                                    )
-
                                     await save_error_snapshot(
                                         f"stream_post_submit_button_handling_timeout_{req_id}"
                                     )
@@ -492,8 +482,6 @@ async def queue_worker() -> None:
                 # 在释放处理锁前执行清空操作，确保原子性
                 try:
                     # 清空流式队列缓存
-                    from api_utils import clear_stream_queue
-
                     await clear_stream_queue()
 
                     # 清空聊天历史（对于所有模式：流式和非流式）
@@ -501,8 +489,6 @@ async def queue_worker() -> None:
                         from server import page_instance, is_page_ready
 
                         if page_instance and is_page_ready:
-                            from browser_utils.page_controller import PageController
-
                             page_controller = PageController(
                                 page_instance, logger, req_id
                             )
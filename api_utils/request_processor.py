@@ -7,9 +7,12 @@ import asyncio
 import json
 import os
 import random
+import shutil
 import time
+from functools import lru_cache
 from typing import Optional, Tuple, Callable, AsyncGenerator, List, Any
 from asyncio import Event, Future
+from urllib.parse import urlparse, unquote
 
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -19,6 +22,7 @@ from playwright.async_api import Page as AsyncPage, Locator, Error as Playwright
 from config import (
     MODEL_NAME,
     SUBMIT_BUTTON_SELECTOR,
+    get_environment_variable,
 )
 from config import ONLY_COLLECT_CURRENT_USER_ATTACHMENTS, UPLOAD_FILES_DIR
 
@@ -38,8 +42,11 @@ from .utils import (
     use_stream_response,
     calculate_usage_stats,
     maybe_execute_tools,
+    clear_stream_queue,
+    extract_data_url_to_local,
 )
-from browser_utils.page_controller import PageController
+from .tools_registry import register_runtime_tools
+from browser_utils.page_controller import PageController, get_cached_locator
 from .context_types import RequestContext
 from .response_generators import gen_sse_from_aux_stream, gen_sse_from_playwright
 from .response_payloads import build_chat_completion_response_json
@@ -64,6 +71,16 @@ from .error_utils import (
 )
 
 
+@lru_cache(maxsize=1)
+def _uses_auxiliary_stream() -> bool:
+    """是否使用辅助流响应路径。
+
+    辅助流代理只在启动时根据 STREAM_PORT 决定是否开启，进程运行期间不会变化，
+    因此首次请求时读取一次即可，无需每个请求重复读取环境变量。
+    """
+    return get_environment_variable('STREAM_PORT') != '0'
+
+
 async def _analyze_model_requirements(req_id: str, context: RequestContext, request: ChatCompletionRequest) -> RequestContext:
     """代理到 model_switching.analyze_model_requirements"""
     return await ms_analyze(req_id, context, request.model, MODEL_NAME)
@@ -120,12 +137,14 @@ async def _prepare_and_validate_request(
     except ValueError as e:
         raise bad_request(req_id, f"无效请求: {e}")
     
-    prepared_prompt, images_list = prepare_combined_prompt(request.messages, req_id, getattr(request, 'tools', None), getattr(request, 'tool_choice', None))
+    # 组合提示会解码 base64 附件并写入磁盘，放到线程中执行，避免阻塞事件循环
+    prepared_prompt, images_list = await asyncio.to_thread(
+        prepare_combined_prompt, request.messages, req_id, getattr(request, 'tools', None), getattr(request, 'tool_choice', None)
+    )
     # 基于 tools/tool_choice 的主动函数执行（支持 per-request MCP 端点）
     try:
         # 将 mcp_endpoint 注入 utils.maybe_execute_tools 的注册逻辑
         if hasattr(request, 'mcp_endpoint') and request.mcp_endpoint:
-            from .tools_registry import register_runtime_tools
             register_runtime_tools(getattr(request, 'tools', None), request.mcp_endpoint)
         tool_exec_results = await maybe_execute_tools(request.messages, request.tools, getattr(request, 'tool_choice', None))
     except Exception:
@@ -151,9 +170,6 @@ async def _prepare_and_validate_request(
                     break
             if latest_user is not None:
                 filtered: List[str] = []
-                from api_utils.utils import extract_data_url_to_local
-                from urllib.parse import urlparse, unquote
-                import os
                 # 收集该条 user 消息上的 data:/file:/绝对路径（存在的）
                 content = getattr(latest_user, 'content', None)
                 # 统一从 messages 附件字段抽取
@@ -171,7 +187,7 @@ async def _prepare_and_validate_request(
                         if not url_value:
                             continue
                         if url_value.startswith('data:'):
-                            fp = extract_data_url_to_local(url_value)
+                            fp = await asyncio.to_thread(extract_data_url_to_local, url_value)
                             if fp:
                                 filtered.append(fp)
                         elif url_value.startswith('file:'):
@@ -197,17 +213,7 @@ async def _handle_response_processing(
     check_client_disconnected: Callable,
 ) -> Optional[Tuple[Event, Locator, Callable]]:
     """处理响应生成"""
-    from server import logger
-    
-    is_streaming = request.stream
-    current_ai_studio_model_id = context.get('current_ai_studio_model_id')
-    
-    # 检查是否使用辅助流
-    from config import get_environment_variable
-    stream_port = get_environment_variable('STREAM_PORT')
-    use_stream = stream_port != '0'
-    
-    if use_stream:
+    if _uses_auxiliary_stream():
         return await _handle_auxiliary_stream_response(req_id, request, context, result_future, submit_button_locator, check_client_disconnected)
     else:
         return await _handle_playwright_response(req_id, request, page, context, result_future, submit_button_locator, check_client_disconnected)
@@ -413,8 +419,6 @@ async def _cleanup_request_resources(req_id: str, disconnect_check_task: Optiona
                                    is_streaming: bool) -> None:
     """清理请求资源"""
     from server import logger
-    from config import UPLOAD_FILES_DIR
-    import os, shutil
     
     if disconnect_check_task and not disconnect_check_task.done():
         disconnect_check_task.cancel()
@@ -431,7 +435,7 @@ async def _cleanup_request_resources(req_id: str, disconnect_check_task: Optiona
     try:
         req_dir = os.path.join(UPLOAD_FILES_DIR, req_id)
         if os.path.isdir(req_dir):
-            shutil.rmtree(req_dir, ignore_errors=True)
+            await asyncio.to_thread(shutil.rmtree, req_dir, ignore_errors=True)
             logger.info(f"[{req_id}] 已清理请求上传目录: {req_dir}")
     except Exception as clean_err:
         logger.warning(f"[{req_id}] 清理上传目录失败: {clean_err}")
@@ -451,7 +455,6 @@ async def _process_request_refactored(
 
     # 优化：在开始任何处理前主动检测客户端连接状态
     from server import logger
-    from config import get_environment_variable
 
     is_connected = await _test_client_connection(req_id, http_request)
     if not is_connected:
@@ -460,12 +463,9 @@ async def _process_request_refactored(
             result_future.set_exception(HTTPException(status_code=499, detail=f"[{req_id}] 客户端在处理开始前已断开连接"))
         return None
 
-    stream_port = get_environment_variable('STREAM_PORT')
-    use_stream = stream_port != '0'
-    if use_stream:
+    if _uses_auxiliary_stream():
         logger.info(f"[{req_id}] 🔧 请求开始前清空流式队列（防止残留数据）...")
         try:
-            from api_utils import clear_stream_queue
             await clear_stream_queue()
             logger.info(f"[{req_id}] ✅ 流式队列已清空")
         except Exception as clear_err:
@@ -479,7 +479,7 @@ async def _process_request_refactored(
     )
     
     page = context['page']
-    submit_button_locator = page.locator(SUBMIT_BUTTON_SELECTOR) if page else None
+    submit_button_locator = get_cached_locator(page, SUBMIT_BUTTON_SELECTOR) if page else None
     completion_event = None
     
     try:
@@ -493,23 +493,18 @@ async def _process_request_refactored(
         prepared_prompt,image_list = await _prepare_and_validate_request(req_id, request, check_client_disconnected)
         # 额外合并顶层与消息级 attachments/files（兼容历史记录）已在下方处理；此处确保路径存在
         try:
-            import os
             valid_images = []
             for p in image_list:
                 if isinstance(p, str) and p and os.path.isabs(p) and os.path.exists(p):
                     valid_images.append(p)
             if len(valid_images) != len(image_list):
-                from server import logger
-                logger.warning(f"[{req_id}] 过滤掉不存在的附件路径: {set(image_list) - set(valid_images)}")
+                context['logger'].warning(f"[{req_id}] 过滤掉不存在的附件路径: {set(image_list) - set(valid_images)}")
             image_list = valid_images
         except Exception:
             pass
         # 兼容: 顶层与消息级附件字段合并到上传列表（仅 data:/file:/绝对路径）
         # 附件来源策略：仅接受当前请求显式提供的 data:/file:/绝对路径（存在的）
         try:
-            from api_utils.utils import extract_data_url_to_local
-            from urllib.parse import urlparse, unquote
-            import os
             # 顶层 attachments
             top_level_atts = getattr(request, 'attachments', None)
             if isinstance(top_level_atts, list) and len(top_level_atts) > 0:
@@ -523,7 +518,7 @@ async def _process_request_refactored(
                     if not url_value:
                         continue
                     if url_value.startswith('data:'):
-                        fp = extract_data_url_to_local(url_value, req_id=req_id)
+                        fp = await asyncio.to_thread(extract_data_url_to_local, url_value, req_id=req_id)
                         if fp:
                             image_list.append(fp)
                     elif url_value.startswith('file:'):
@@ -549,7 +544,7 @@ async def _process_request_refactored(
                         if not url_value:
                             continue
                         if url_value.startswith('data:'):
-                            fp = extract_data_url_to_local(url_value, req_id=req_id)
+                            fp = await asyncio.to_thread(extract_data_url_to_local, url_value, req_id=req_id)
                             if fp:
                                 image_list.append(fp)
                         elif url_value.startswith('file:'):
@@ -8,7 +8,8 @@ from asyncio import Event
 from playwright.async_api import Page as AsyncPage
 
 from models import ClientDisconnectedError, ChatCompletionRequest
-from config import CHAT_COMPLETION_ID_PREFIX
+from browser_utils.page_controller import PageController
+from config import CHAT_COMPLETION_ID_PREFIX, PSEUDO_STREAM_DELAY
 from .utils import (
     use_stream_response,
     calculate_usage_stats,
@@ -16,6 +17,7 @@ from .utils import (
     generate_sse_stop_chunk,
 )
 from .common_utils import random_id
+from .sse import make_sse_chunk_formatter
 
 
 async def gen_sse_from_aux_stream(
@@ -271,16 +273,14 @@ async def gen_sse_from_playwright(
     completion_event: Event,
 ) -> AsyncGenerator[str, None]:
     """Playwright 最终响应 -> OpenAI 兼容 SSE 生成器。"""
-    # Reuse already-imported helpers from utils to avoid repeated imports
-    from models import ClientDisconnectedError
-    from browser_utils.page_controller import PageController
-
     data_receiving = False
     try:
         page_controller = PageController(page, logger, req_id)
         final_content = await page_controller.get_response(check_client_disconnected)
         data_receiving = True
+        format_chunk = make_sse_chunk_formatter(req_id, model_name_for_stream)
         lines = final_content.split("\n")
+        last_line_idx = len(lines) - 1
         for line_idx, line in enumerate(lines):
             try:
                 check_client_disconnected(f"Playwright流式生成器循环 ({req_id}): ")
@@ -292,15 +292,12 @@ async def gen_sse_from_playwright(
                     )
                     completion_event.set()
                 break
-            if line:
-                chunk_size = 5
-                for i in range(0, len(line), chunk_size):
-                    chunk = line[i : i + chunk_size]
-                    yield generate_sse_chunk(chunk, req_id, model_name_for_stream)
-                    await asyncio.sleep(0.03)
-            if line_idx < len(lines) - 1:
-                yield generate_sse_chunk("\n", req_id, model_name_for_stream)
-                await asyncio.sleep(0.01)
+            # 内容已完整获取，按行输出即可，不再拆成 5 字符小块逐个延迟发送
+            chunk = line if line_idx == last_line_idx else line + "\n"
+            if chunk:
+                yield format_chunk(chunk)
+                if PSEUDO_STREAM_DELAY > 0:
+                    await asyncio.sleep(PSEUDO_STREAM_DELAY)
         usage_stats = calculate_usage_stats(
             [msg.model_dump() for msg in request.messages],
             final_content,
@@ -1,6 +1,8 @@
+import json
 import logging
+from typing import Any, Dict
 from fastapi import Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from ..dependencies import get_logger
 
@@ -13,12 +15,23 @@ class ApiKeyTestRequest(BaseModel):
     key: str
 
 
+# 密钥列表响应缓存：密钥集合未变化 (API_KEYS_VERSION 不变) 时直接复用已序列化的响应体
+_api_keys_response_cache: Dict[str, Any] = {"version": None, "body": None}
+
+
 async def get_api_keys(logger: logging.Logger = Depends(get_logger)):
     from .. import auth_utils
     try:
         auth_utils.initialize_keys()
-        keys_info = [{"value": key, "status": "有效"} for key in auth_utils.API_KEYS]
-        return JSONResponse(content={"success": True, "keys": keys_info, "total_count": len(keys_info)})
+        if _api_keys_response_cache["version"] != auth_utils.API_KEYS_VERSION:
+            keys_info = [{"value": key, "status": "有效"} for key in auth_utils.API_KEYS]
+            _api_keys_response_cache["body"] = json.dumps(
+                {"success": True, "keys": keys_info, "total_count": len(keys_info)},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            _api_keys_response_cache["version"] = auth_utils.API_KEYS_VERSION
+        return Response(content=_api_keys_response_cache["body"], media_type="application/json")
     except Exception as e:
         logger.error(f"获取API密钥列表失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
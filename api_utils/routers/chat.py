@@ -1,3 +1,4 @@
+import itertools
 import os
 import random
 import time
@@ -12,6 +13,12 @@ from fastapi.responses import JSONResponse
 from config import get_environment_variable
 from ..error_utils import service_unavailable
 
+# 请求 ID = 进程启动时生成的随机前缀 + 自增计数 (4 位十六进制，超出后回绕)。
+# 每个请求只需一次整数自增，无需再逐字符随机生成；总长度固定为 7，
+# save_error_snapshot 等处依赖该长度从名称中识别请求 ID。
+_REQ_ID_PREFIX = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=3))
+_req_id_counter = itertools.count(1)
+
 
 async def chat_completions(
     request: ChatCompletionRequest,
@@ -21,7 +28,7 @@ async def chat_completions(
     server_state: dict = Depends(get_server_state),
     worker_task = Depends(get_worker_task)
 ) -> JSONResponse:
-    req_id = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=7))
+    req_id = f"{_REQ_ID_PREFIX}{next(_req_id_counter) & 0xFFFF:04x}"
     logger.info(f"[{req_id}] 收到 /v1/chat/completions 请求 (Stream={request.stream})")
 
     launch_mode = get_environment_variable('LAUNCH_MODE', 'unknown')
@@ -36,7 +43,8 @@ async def chat_completions(
         raise service_unavailable(req_id)
 
     result_future = Future()
-    await request_queue.put({
+    # 请求队列无容量上限，put_nowait 总能立即入队，省去一次协程创建与调度
+    request_queue.put_nowait({
         "req_id": req_id, "request_data": request, "http_request": http_request,
         "result_future": result_future, "enqueue_time": time.time(), "cancelled": False
     })
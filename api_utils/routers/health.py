@@ -2,10 +2,14 @@ import os
 from typing import Any, Dict
 from asyncio import Queue
 from fastapi import Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from ..dependencies import get_server_state, get_worker_task, get_request_queue
 from config import get_environment_variable
 
+# 最近一次健康检查结果缓存。只要状态输入 (服务器状态、Worker、队列长度、启动模式) 未变化，
+# 就直接复用已序列化的响应体，避免探针高频轮询时反复拼装消息并序列化 JSON。
+_health_cache: Dict[str, Any] = {"key": None, "body": b"", "status_code": 200}
+
 
 async def health_check(
     server_state: Dict[str, Any] = Depends(get_server_state),
@@ -15,6 +19,11 @@ async def health_check(
     is_worker_running = bool(worker_task and not worker_task.done())
     launch_mode = get_environment_variable('LAUNCH_MODE', 'unknown')
     browser_page_critical = launch_mode != "direct_debug_no_browser"
+    q_size = request_queue.qsize() if request_queue else -1
+
+    cache_key = (tuple(server_state.items()), is_worker_running, q_size, launch_mode)
+    if _health_cache["key"] == cache_key:
+        return Response(content=_health_cache["body"], status_code=_health_cache["status_code"], media_type="application/json")
 
     core_ready_conditions = [not server_state["is_initializing"], server_state["is_playwright_ready"]]
     if browser_page_critical:
@@ -22,7 +31,6 @@ async def health_check(
 
     is_core_ready = all(core_ready_conditions)
     status_val = "OK" if is_core_ready and is_worker_running else "Error"
-    q_size = request_queue.qsize() if request_queue else -1
 
     status_message_parts = []
     if server_state["is_initializing"]: status_message_parts.append("初始化进行中")
@@ -40,7 +48,12 @@ async def health_check(
 
     if status_val == "OK":
         status["message"] = f"服务运行中;队列长度: {q_size}。"
-        return JSONResponse(content=status, status_code=200)
+        response = JSONResponse(content=status, status_code=200)
     else:
         status["message"] = f"服务不可用;问题: {(', '.join(status_message_parts) or '未知原因')}. 队列长度: {q_size}."
-        return JSONResponse(content=status, status_code=503)
+        response = JSONResponse(content=status, status_code=503)
+
+    _health_cache["key"] = cache_key
+    _health_cache["body"] = response.body
+    _health_cache["status_code"] = response.status_code
+    return response
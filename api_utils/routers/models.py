@@ -17,6 +17,25 @@ import logging
 import asyncio
 
 
+# /v1/models 过滤结果缓存。parsed_model_list 只会被整体替换 (不会原地修改)，
+# 因此按列表对象身份和排除集合大小判断缓存是否失效。
+_filtered_models_cache: Dict[str, Any] = {"source": None, "excluded_count": -1, "data": []}
+
+
+def _get_filtered_models(parsed_model_list: List[Dict[str, Any]], excluded_model_ids: Set[str]) -> List[Dict[str, Any]]:
+    cache = _filtered_models_cache
+    if cache["source"] is parsed_model_list and cache["excluded_count"] == len(excluded_model_ids):
+        return cache["data"]
+    final_model_list = [
+        m for m in parsed_model_list
+        if isinstance(m, dict) and m.get("id") not in excluded_model_ids
+    ]
+    cache["source"] = parsed_model_list
+    cache["excluded_count"] = len(excluded_model_ids)
+    cache["data"] = final_model_list
+    return final_model_list
+
+
 async def list_models(
     logger: logging.Logger = Depends(get_logger),
     model_list_fetch_event: Event = Depends(get_model_list_fetch_event),
@@ -38,11 +57,7 @@ async def list_models(
                 model_list_fetch_event.set()
 
     if parsed_model_list:
-        final_model_list = [
-            m for m in parsed_model_list
-            if isinstance(m, dict) and m.get("id") not in excluded_model_ids
-        ]
-        return {"object": "list", "data": final_model_list}
+        return {"object": "list", "data": _get_filtered_models(parsed_model_list, excluded_model_ids)}
     else:
         logger.warning("模型列表为空，返回默认后备模型。")
         return {"object": "list", "data": [{
@@ -23,7 +23,7 @@ async def cancel_queued_request(req_id: str, request_queue: Queue, logger: loggi
             items_to_requeue.append(item)
     finally:
         for item in items_to_requeue:
-            await request_queue.put(item)
+            request_queue.put_nowait(item)
     return found
 
 
@@ -1,6 +1,8 @@
 import json
 import time
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
+
+_SSE_CONTENT_PLACEHOLDER = "\x00sse-content\x00"
 
 
 def generate_sse_chunk(delta: str, req_id: str, model: str) -> str:
@@ -14,6 +16,22 @@ def generate_sse_chunk(delta: str, req_id: str, model: str) -> str:
     return f"data: {json.dumps(chunk_data)}\n\n"
 
 
+def make_sse_chunk_formatter(req_id: str, model: str) -> Callable[[str], str]:
+    """为单个响应流预先生成内容块的 SSE 帧头尾，返回 delta -> SSE 文本的格式化函数。
+
+    输出与 generate_sse_chunk 相同，只是 created 固定为流开始时间；
+    每个块只需对 delta 字符串本身做 JSON 转义。
+    """
+    template = generate_sse_chunk(_SSE_CONTENT_PLACEHOLDER, req_id, model)
+    head, tail = template.split(json.dumps(_SSE_CONTENT_PLACEHOLDER), 1)
+    encode = json.dumps
+
+    def format_chunk(delta: str) -> str:
+        return head + encode(delta) + tail
+
+    return format_chunk
+
+
 def generate_sse_stop_chunk(req_id: str, model: str, reason: str = "stop", usage: Optional[Dict] = None) -> str:
     stop_chunk_data = {
         "id": f"chatcmpl-{req_id}",
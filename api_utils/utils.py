@@ -10,7 +10,6 @@ from typing import Any, Dict, List, Optional, AsyncGenerator, Tuple, Union
 from models import Message
 import re
 import base64
-import requests  # retained for potential outbound helpers; remove if unused later
 import os
 import hashlib
 from urllib.parse import urlparse, unquote
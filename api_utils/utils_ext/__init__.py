@@ -4,14 +4,14 @@ This package groups stream, helper, validation, files, and tokens utilities.
 """
 
 from .stream import use_stream_response, clear_stream_queue
-from .helper import use_helper_get_response
+from .helper import use_helper_get_response, close_helper_session
 from .validation import validate_chat_request
 from .files import _extension_for_mime, extract_data_url_to_local, save_blob_to_local
 from .tokens import estimate_tokens, calculate_usage_stats
 
 __all__ = [
     'use_stream_response', 'clear_stream_queue',
-    'use_helper_get_response',
+    'use_helper_get_response', 'close_helper_session',
     'validate_chat_request',
     '_extension_for_mime', 'extract_data_url_to_local', 'save_blob_to_local',
     'estimate_tokens', 'calculate_usage_stats',
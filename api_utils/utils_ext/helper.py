@@ -1,25 +1,43 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+
+# 进程内共享的 Helper 会话，复用连接池，避免每次请求都重新建立 TCP/TLS 连接
+_helper_session: Any = None
+
+
+def _get_helper_session() -> Any:
+    global _helper_session
+    if _helper_session is None or _helper_session.closed:
+        import aiohttp
+        _helper_session = aiohttp.ClientSession()
+    return _helper_session
+
+
+async def close_helper_session() -> None:
+    """关闭共享的 Helper 会话（在应用关闭时调用）。"""
+    global _helper_session
+    if _helper_session is not None and not _helper_session.closed:
+        await _helper_session.close()
+    _helper_session = None
 
 
 async def use_helper_get_response(helper_endpoint: str, helper_sapisid: str) -> AsyncGenerator[str, None]:
     from server import logger
-    import aiohttp
 
     logger.info(f"正在尝试使用Helper端点: {helper_endpoint}")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Content-Type': 'application/json',
-                'Cookie': f'SAPISID={helper_sapisid}' if helper_sapisid else ''
-            }
-            async with session.get(helper_endpoint, headers=headers) as response:
-                if response.status == 200:
-                    async for chunk in response.content.iter_chunked(1024):
-                        if chunk:
-                            yield chunk.decode('utf-8', errors='ignore')
-                else:
-                    logger.error(f"Helper端点返回错误状态: {response.status}")
+        session = _get_helper_session()
+        headers = {
+            'Content-Type': 'application/json',
+            'Cookie': f'SAPISID={helper_sapisid}' if helper_sapisid else ''
+        }
+        async with session.get(helper_endpoint, headers=headers) as response:
+            if response.status == 200:
+                async for chunk in response.content.iter_chunked(1024):
+                    if chunk:
+                        yield chunk.decode('utf-8', errors='ignore')
+            else:
+                logger.error(f"Helper端点返回错误状态: {response.status}")
     except Exception as e:
         logger.error(f"使用Helper端点时出错: {e}")
 
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 from typing import Any, AsyncGenerator
 
 
@@ -12,6 +13,9 @@ async def use_stream_response(req_id: str) -> AsyncGenerator[Any, None]:
         return
 
     logger.info(f"[{req_id}] 开始使用流响应")
+    # 逐项日志位于每个流数据块的热路径上，级别只在流开始时判断一次，
+    # 避免非 DEBUG 级别下也为每个数据块构造 f-string
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
     empty_count = 0
     max_empty_retries = 300
@@ -30,9 +34,10 @@ async def use_stream_response(req_id: str) -> AsyncGenerator[Any, None]:
                 empty_count = 0
                 data_received = True
                 received_items_count += 1
-                logger.debug(
-                    f"[{req_id}] 接收到流数据[#{received_items_count}]: {type(data)}"
-                )
+                if debug_enabled:
+                    logger.debug(
+                        f"[{req_id}] 接收到流数据[#{received_items_count}]: {type(data)}"
+                    )
 
                 if isinstance(data, str):
                     try:
@@ -65,7 +70,8 @@ async def use_stream_response(req_id: str) -> AsyncGenerator[Any, None]:
                             stale_done_ignored = False
                             yield parsed_data
                     except json.JSONDecodeError:
-                        logger.debug(f"[{req_id}] 返回非JSON字符串数据")
+                        if debug_enabled:
+                            logger.debug(f"[{req_id}] 返回非JSON字符串数据")
                         has_content = True
                         stale_done_ignored = False
                         yield data
@@ -1,10 +1,15 @@
+import re
 from typing import List, Dict
 
+# 中日韩统一表意文字、CJK 标点与全角字符，按 1.5 字符/token 估算
+_CJK_CHARS_RE = re.compile('[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]')
+
 
 def estimate_tokens(text: str) -> int:
     if not text:
         return 0
-    chinese_chars = sum(1 for char in text if '\u4e00' <= char <= '\u9fff' or '\u3000' <= char <= '\u303f' or '\uff00' <= char <= '\uffef')
+    # 由正则在 C 层完成逐字符判断，避免长文本上的 Python 级生成器循环
+    chinese_chars = len(text) - len(_CJK_CHARS_RE.sub('', text))
     non_chinese_chars = len(text) - chinese_chars
     chinese_tokens = chinese_chars / 1.5
     english_tokens = non_chinese_chars / 4.0
@@ -12,11 +17,9 @@ def estimate_tokens(text: str) -> int:
 
 
 def calculate_usage_stats(messages: List[dict], response_content: str, reasoning_content: str = None) -> Dict[str, int]:
-    prompt_text = ""
-    for message in messages:
-        role = message.get("role", "")
-        content = message.get("content", "")
-        prompt_text += f"{role}: {content}\n"
+    prompt_text = "".join(
+        f"{message.get('role', '')}: {message.get('content', '')}\n" for message in messages
+    )
     prompt_tokens = estimate_tokens(prompt_text)
 
     completion_text = response_content or ""
@@ -24,6 +24,18 @@ from models import ClientDisconnectedError
 
 logger = logging.getLogger("AIStudioProxyServer")
 
+# 油猴脚本模型解析所用正则，模块加载时预编译
+_SCRIPT_VERSION_RE = re.compile(r'const\s+SCRIPT_VERSION\s*=\s*[\'"]([^\'"]+)[\'"]')
+_MODELS_ARRAY_RE = re.compile(r'const\s+MODELS_TO_INJECT\s*=\s*(\[.*?\]);', re.DOTALL)
+_JS_COMMENT_RE = re.compile(r'//.*?$', re.MULTILINE)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_SINGLE_QUOTED_VALUE_RE = re.compile(r"(\w+):\s*'([^']*)'")
+_BACKTICK_VALUE_RE = re.compile(r'(\w+):\s*`([^`]*)`')
+_BARE_KEY_RE = re.compile(r'(\w+):')
+
+# 油猴脚本模型解析结果缓存: (脚本路径, mtime_ns, 文件大小) -> 模型列表
+_userscript_models_cache: Dict[tuple, List[Dict[str, str]]] = {}
+
 async def get_raw_text_content(response_element: Locator, previous_text: str, req_id: str) -> str:
     """从响应元素获取原始文本内容"""
     raw_text = previous_text
@@ -65,13 +77,11 @@ def _parse_userscript_models(script_content: str):
     """从油猴脚本中解析模型列表 - 使用JSON解析方式"""
     try:
         # 查找脚本版本号
-        version_pattern = r'const\s+SCRIPT_VERSION\s*=\s*[\'"]([^\'"]+)[\'"]'
-        version_match = re.search(version_pattern, script_content)
+        version_match = _SCRIPT_VERSION_RE.search(script_content)
         script_version = version_match.group(1) if version_match else "v1.6"
 
         # 查找 MODELS_TO_INJECT 数组的内容
-        models_array_pattern = r'const\s+MODELS_TO_INJECT\s*=\s*(\[.*?\]);'
-        models_match = re.search(models_array_pattern, script_content, re.DOTALL)
+        models_match = _MODELS_ARRAY_RE.search(script_content)
 
         if not models_match:
             logger.warning("未找到 MODELS_TO_INJECT 数组")
@@ -84,21 +94,20 @@ def _parse_userscript_models(script_content: str):
         models_js_code = models_js_code.replace('${SCRIPT_VERSION}', script_version)
 
         # 2. 移除JavaScript注释
-        models_js_code = re.sub(r'//.*?$', '', models_js_code, flags=re.MULTILINE)
+        models_js_code = _JS_COMMENT_RE.sub('', models_js_code)
 
         # 3. 将JavaScript对象转换为JSON格式
         # 移除尾随逗号
-        models_js_code = re.sub(r',\s*([}\]])', r'\1', models_js_code)
+        models_js_code = _TRAILING_COMMA_RE.sub(r'\1', models_js_code)
 
         # 替换单引号为双引号
-        models_js_code = re.sub(r"(\w+):\s*'([^']*)'", r'"\1": "\2"', models_js_code)
+        models_js_code = _SINGLE_QUOTED_VALUE_RE.sub(r'"\1": "\2"', models_js_code)
         # 替换反引号为双引号
-        models_js_code = re.sub(r'(\w+):\s*`([^`]*)`', r'"\1": "\2"', models_js_code)
+        models_js_code = _BACKTICK_VALUE_RE.sub(r'"\1": "\2"', models_js_code)
         # 确保属性名用双引号
-        models_js_code = re.sub(r'(\w+):', r'"\1":', models_js_code)
+        models_js_code = _BARE_KEY_RE.sub(r'"\1":', models_js_code)
 
         # 4. 解析JSON
-        import json
         models_data = json.loads(models_js_code)
 
         models = []
@@ -135,12 +144,19 @@ def _get_injected_models():
             # 脚本文件不存在，静默返回空列表
             return []
 
-        # 读取油猴脚本内容
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script_content = f.read()
-
-        # 从脚本中解析模型列表
-        models = _parse_userscript_models(script_content)
+        # 脚本未变化时直接复用上次的解析结果，避免每次拦截模型列表都重新读取和解析
+        script_stat = os.stat(script_path)
+        cache_key = (script_path, script_stat.st_mtime_ns, script_stat.st_size)
+        models = _userscript_models_cache.get(cache_key)
+        if models is None:
+            # 读取油猴脚本内容
+            with open(script_path, 'r', encoding='utf-8') as f:
+                script_content = f.read()
+
+            # 从脚本中解析模型列表
+            models = _parse_userscript_models(script_content)
+            _userscript_models_cache.clear()
+            _userscript_models_cache[cache_key] = models
 
         if not models:
             return []
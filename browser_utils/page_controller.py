@@ -3,9 +3,12 @@ PageController模块
 封装了所有与Playwright页面直接交互的复杂逻辑。
 """
 import asyncio
+import os
 import re
+import weakref
 from typing import Any, Callable, Dict, List, Optional
 
+from playwright.async_api import Locator
 from playwright.async_api import Page as AsyncPage
 from playwright.async_api import TimeoutError
 from playwright.async_api import expect as expect_async
@@ -39,15 +42,74 @@ from .operations import (_get_final_response_content,
 from .thinking_normalizer import (format_directive_log,
                                   normalize_reasoning_effort)
 
+# 浏览器平台是否为 macOS 的检测结果。页面加载后 UA 不会变化，首次检测后复用，
+# 避免每次提交都通过 page.evaluate 往返浏览器读取 navigator 信息。
+_browser_is_mac: Optional[bool] = None
+
+# 按页面缓存的固定选择器 Locator: page -> {selector: Locator}。
+# Locator 只是惰性的选择器句柄，可跨请求复用；页面对象被回收时缓存随之释放。
+_page_locator_cache: "weakref.WeakKeyDictionary[AsyncPage, Dict[str, Locator]]" = weakref.WeakKeyDictionary()
+
+
+def get_cached_locator(page: AsyncPage, selector: str) -> Locator:
+    """返回页面上指定选择器的缓存 Locator，首次访问时创建。"""
+    page_locators = _page_locator_cache.get(page)
+    if page_locators is None:
+        page_locators = _page_locator_cache[page] = {}
+    locator = page_locators.get(selector)
+    if locator is None:
+        locator = page_locators[selector] = page.locator(selector)
+    return locator
+
 
 class PageController:
     """封装了与AI Studio页面交互的所有操作。"""
 
+    # 每个请求都会创建若干个实例，使用 __slots__ 省去实例字典
+    __slots__ = ("page", "logger", "req_id")
+
     def __init__(self, page: AsyncPage, logger, req_id: str):
         self.page = page
         self.logger = logger
         self.req_id = req_id
 
+    def _locator(self, selector: str) -> Locator:
+        """获取当前页面上固定选择器的缓存 Locator。"""
+        return get_cached_locator(self.page, selector)
+
+    async def _is_mac_shortcut_host(self) -> bool:
+        """判断提交快捷键是否应使用 Meta 修饰键 (macOS)。"""
+        global _browser_is_mac
+
+        host_os_from_launcher = os.environ.get("HOST_OS_FOR_SHORTCUT")
+        if host_os_from_launcher == "Darwin":
+            return True
+        if host_os_from_launcher in ["Windows", "Linux"]:
+            return False
+        if _browser_is_mac is not None:
+            return _browser_is_mac
+
+        # 使用浏览器检测
+        try:
+            user_agent_data_platform = await self.page.evaluate(
+                "() => navigator.userAgentData?.platform || ''"
+            )
+        except Exception:
+            user_agent_string = await self.page.evaluate(
+                "() => navigator.userAgent || ''"
+            )
+            user_agent_string_lower = user_agent_string.lower()
+            if (
+                "macintosh" in user_agent_string_lower
+                or "mac os x" in user_agent_string_lower
+            ):
+                user_agent_data_platform = "macOS"
+            else:
+                user_agent_data_platform = "Other"
+
+        _browser_is_mac = "mac" in user_agent_data_platform.lower()
+        return _browser_is_mac
+
     async def _check_disconnect(self, check_client_disconnected: Callable, stage: str):
         """检查客户端是否断开连接。"""
         if check_client_disconnected(stage):
@@ -258,7 +320,7 @@ class PageController:
 
     async def _has_thinking_dropdown(self) -> bool:
         try:
-            locator = self.page.locator(THINKING_LEVEL_SELECT_SELECTOR)
+            locator = self._locator(THINKING_LEVEL_SELECT_SELECTOR)
             count = await locator.count()
             if count == 0:
                 return False
@@ -297,7 +359,7 @@ class PageController:
             else THINKING_LEVEL_OPTION_LOW_SELECTOR
         )
         try:
-            trigger = self.page.locator(THINKING_LEVEL_SELECT_SELECTOR)
+            trigger = self._locator(THINKING_LEVEL_SELECT_SELECTOR)
             await expect_async(trigger).to_be_visible(timeout=5000)
             await trigger.scroll_into_view_if_needed()
             await trigger.click(timeout=CLICK_TIMEOUT_MS)
@@ -345,7 +407,7 @@ class PageController:
         """
         self.logger.info(f"[{self.req_id}] 设置思考预算值: {token_budget} tokens")
 
-        budget_input_locator = self.page.locator(THINKING_BUDGET_INPUT_SELECTOR)
+        budget_input_locator = self._locator(THINKING_BUDGET_INPUT_SELECTOR)
 
         try:
             await expect_async(budget_input_locator).to_be_visible(timeout=5000)
@@ -576,7 +638,7 @@ class PageController:
         """仅负责打开 URL Context 开关，前提是面板已展开。"""
         try:
             self.logger.info(f"[{self.req_id}] 检查并启用 URL Context 开关...")
-            use_url_content_selector = self.page.locator(USE_URL_CONTEXT_SELECTOR)
+            use_url_content_selector = self._locator(USE_URL_CONTEXT_SELECTOR)
             await expect_async(use_url_content_selector).to_be_visible(timeout=5000)
 
             is_checked = await use_url_content_selector.get_attribute("aria-checked")
@@ -765,7 +827,7 @@ class PageController:
             self.logger.info(
                 f"[{self.req_id}] 请求温度 ({clamped_temp}) 与缓存值 ({cached_temp}) 不一致或缓存中无值。需要与页面交互。"
             )
-            temp_input_locator = self.page.locator(TEMPERATURE_INPUT_SELECTOR)
+            temp_input_locator = self._locator(TEMPERATURE_INPUT_SELECTOR)
 
             try:
                 await expect_async(temp_input_locator).to_be_visible(timeout=5000)
@@ -882,7 +944,7 @@ class PageController:
                 )
                 return
 
-            max_tokens_input_locator = self.page.locator(MAX_OUTPUT_TOKENS_SELECTOR)
+            max_tokens_input_locator = self._locator(MAX_OUTPUT_TOKENS_SELECTOR)
 
             try:
                 await expect_async(max_tokens_input_locator).to_be_visible(timeout=5000)
@@ -975,10 +1037,8 @@ class PageController:
                 self.logger.info(f"[{self.req_id}] 请求的停止序列与缓存值一致。跳过页面交互。")
                 return
 
-            stop_input_locator = self.page.locator(STOP_SEQUENCE_INPUT_SELECTOR)
-            remove_chip_buttons_locator = self.page.locator(
-                MAT_CHIP_REMOVE_BUTTON_SELECTOR
-            )
+            stop_input_locator = self._locator(STOP_SEQUENCE_INPUT_SELECTOR)
+            remove_chip_buttons_locator = self._locator(MAT_CHIP_REMOVE_BUTTON_SELECTOR)
 
             try:
                 # 清空已有的停止序列
@@ -1028,7 +1088,7 @@ class PageController:
                 f"[{self.req_id}] 请求的 Top P {top_p} 超出范围 [0, 1]，已调整为 {clamped_top_p}"
             )
 
-        top_p_input_locator = self.page.locator(TOP_P_INPUT_SELECTOR)
+        top_p_input_locator = self._locator(TOP_P_INPUT_SELECTOR)
         try:
             await expect_async(top_p_input_locator).to_be_visible(timeout=5000)
             await self._check_disconnect(check_client_disconnected, "Top P 调整 - 输入框可见后")
@@ -1081,7 +1141,7 @@ class PageController:
         try:
             # 一般是使用流式代理时遇到,流式输出已结束,但页面上AI仍回复个不停,此时会锁住清空按钮,但页面仍是/new_chat,而跳过后续清空操作
             # 导致后续请求无法发出而卡住,故先检查并点击发送按钮(此时是停止功能)
-            submit_button_locator = self.page.locator(SUBMIT_BUTTON_SELECTOR)
+            submit_button_locator = self._locator(SUBMIT_BUTTON_SELECTOR)
             try:
                 self.logger.info(f"[{self.req_id}] 尝试检查发送按钮状态...")
                 # 使用较短的超时时间（1秒），避免长时间阻塞，因为这不是清空流程的常见步骤
@@ -1101,11 +1161,9 @@ class PageController:
                     f"[{self.req_id}] 发送按钮不可用或检查/点击时发生Playwright错误。符合预期,继续检查清空按钮。"
                 )
 
-            clear_chat_button_locator = self.page.locator(CLEAR_CHAT_BUTTON_SELECTOR)
-            confirm_button_locator = self.page.locator(
-                CLEAR_CHAT_CONFIRM_BUTTON_SELECTOR
-            )
-            overlay_locator = self.page.locator(OVERLAY_SELECTOR)
+            clear_chat_button_locator = self._locator(CLEAR_CHAT_BUTTON_SELECTOR)
+            confirm_button_locator = self._locator(CLEAR_CHAT_CONFIRM_BUTTON_SELECTOR)
+            overlay_locator = self._locator(OVERLAY_SELECTOR)
 
             can_attempt_clear = False
             try:
@@ -1321,7 +1379,7 @@ class PageController:
 
     async def _verify_chat_cleared(self, check_client_disconnected: Callable):
         """验证聊天已清空"""
-        last_response_container = self.page.locator(RESPONSE_CONTAINER_SELECTOR).last
+        last_response_container = self._locator(RESPONSE_CONTAINER_SELECTOR).last
         await self._check_disconnect(
             check_client_disconnected, "After Clear Post-Check"
         )
@@ -1410,16 +1468,20 @@ class PageController:
         while asyncio.get_event_loop().time() < end:
             try:
                 # NOTE: normalize JS eval string to avoid parser confusion
+                # 按开销从低到高依次统计，任一计数已满足期望时直接返回，跳过后续的属性子串选择器扫描
                 counts = await wrapper_locator.evaluate(
                     """
-                    (el) => {
+                    (el, expectedMin) => {
                       const result = {inputs:0, chips:0, blobs:0};
                       try { el.querySelectorAll('input[type="file"]').forEach(i => { result.inputs += (i.files ? i.files.length : 0); }); } catch(e){}
-                      try { result.chips = el.querySelectorAll('button[aria-label*="Remove" i], button[aria-label*="asset" i]').length; } catch(e){}
+                      if (result.inputs >= expectedMin) return result;
                       try { result.blobs = el.querySelectorAll('img[src^="blob:"], video[src^="blob:"]').length; } catch(e){}
+                      if (result.blobs >= expectedMin) return result;
+                      try { result.chips = el.querySelectorAll('button[aria-label*="Remove" i], button[aria-label*="asset" i]').length; } catch(e){}
                       return result;
                     }
-                    """
+                    """,
+                    expected_min,
                 )
 
                 total = 0
@@ -1531,11 +1593,11 @@ class PageController:
     ):
         """提交提示到页面。"""
         self.logger.info(f"[{self.req_id}] 填充并提交提示 ({len(prompt)} chars)...")
-        prompt_textarea_locator = self.page.locator(PROMPT_TEXTAREA_SELECTOR)
+        prompt_textarea_locator = self._locator(PROMPT_TEXTAREA_SELECTOR)
         autosize_wrapper_locator = self.page.locator(
             "ms-prompt-input-wrapper ms-autosize-textarea"
         )
-        submit_button_locator = self.page.locator(SUBMIT_BUTTON_SELECTOR)
+        submit_button_locator = self._locator(SUBMIT_BUTTON_SELECTOR)
 
         try:
             await expect_async(prompt_textarea_locator).to_be_visible(timeout=5000)
@@ -1734,37 +1796,9 @@ class PageController:
         self, prompt_textarea_locator, check_client_disconnected: Callable
     ) -> bool:
         """优先使用回车键提交。"""
-        import os
-
         try:
             # 检测操作系统
-            host_os_from_launcher = os.environ.get("HOST_OS_FOR_SHORTCUT")
-            is_mac_determined = False
-
-            if host_os_from_launcher == "Darwin":
-                is_mac_determined = True
-            elif host_os_from_launcher in ["Windows", "Linux"]:
-                is_mac_determined = False
-            else:
-                # 使用浏览器检测
-                try:
-                    user_agent_data_platform = await self.page.evaluate(
-                        "() => navigator.userAgentData?.platform || ''"
-                    )
-                except Exception:
-                    user_agent_string = await self.page.evaluate(
-                        "() => navigator.userAgent || ''"
-                    )
-                    user_agent_string_lower = user_agent_string.lower()
-                    if (
-                        "macintosh" in user_agent_string_lower
-                        or "mac os x" in user_agent_string_lower
-                    ):
-                        user_agent_data_platform = "macOS"
-                    else:
-                        user_agent_data_platform = "Other"
-
-                is_mac_determined = "mac" in user_agent_data_platform.lower()
+            is_mac_determined = await self._is_mac_shortcut_host()
 
             shortcut_modifier = "Meta" if is_mac_determined else "Control"
             shortcut_key = "Enter"
@@ -1809,7 +1843,7 @@ class PageController:
 
                 # 方法2: 检查提交按钮状态
                 if not submission_success:
-                    submit_button_locator = self.page.locator(SUBMIT_BUTTON_SELECTOR)
+                    submit_button_locator = self._locator(SUBMIT_BUTTON_SELECTOR)
                     try:
                         is_disabled = await submit_button_locator.is_disabled(
                             timeout=2000
@@ -1823,9 +1857,7 @@ class PageController:
                 # 方法3: 检查是否有响应容器出现
                 if not submission_success:
                     try:
-                        response_container = self.page.locator(
-                            RESPONSE_CONTAINER_SELECTOR
-                        )
+                        response_container = self._locator(RESPONSE_CONTAINER_SELECTOR)
                         container_count = await response_container.count()
                         if container_count > 0:
                             # 检查最后一个容器是否是新的
@@ -1856,33 +1888,8 @@ class PageController:
         self, prompt_textarea_locator, check_client_disconnected: Callable
     ) -> bool:
         """尝试使用组合键提交 (Meta/Control + Enter)。"""
-        import os
-
         try:
-            host_os_from_launcher = os.environ.get("HOST_OS_FOR_SHORTCUT")
-            is_mac_determined = False
-            if host_os_from_launcher == "Darwin":
-                is_mac_determined = True
-            elif host_os_from_launcher in ["Windows", "Linux"]:
-                is_mac_determined = False
-            else:
-                try:
-                    user_agent_data_platform = await self.page.evaluate(
-                        "() => navigator.userAgentData?.platform || ''"
-                    )
-                except Exception:
-                    user_agent_string = await self.page.evaluate(
-                        "() => navigator.userAgent || ''"
-                    )
-                    user_agent_string_lower = user_agent_string.lower()
-                    if (
-                        "macintosh" in user_agent_string_lower
-                        or "mac os x" in user_agent_string_lower
-                    ):
-                        user_agent_data_platform = "macOS"
-                    else:
-                        user_agent_data_platform = "Other"
-                is_mac_determined = "mac" in user_agent_data_platform.lower()
+            is_mac_determined = await self._is_mac_shortcut_host()
 
             shortcut_modifier = "Meta" if is_mac_determined else "Control"
             shortcut_key = "Enter"
@@ -1927,7 +1934,7 @@ class PageController:
                     self.logger.info(f"[{self.req_id}] 验证方法1: 输入框已清空，组合键提交成功")
                     submission_success = True
                 if not submission_success:
-                    submit_button_locator = self.page.locator(SUBMIT_BUTTON_SELECTOR)
+                    submit_button_locator = self._locator(SUBMIT_BUTTON_SELECTOR)
                     try:
                         is_disabled = await submit_button_locator.is_disabled(
                             timeout=2000
@@ -1939,9 +1946,7 @@ class PageController:
                         pass
                 if not submission_success:
                     try:
-                        response_container = self.page.locator(
-                            RESPONSE_CONTAINER_SELECTOR
-                        )
+                        response_container = self._locator(RESPONSE_CONTAINER_SELECTOR)
                         container_count = await response_container.count()
                         if container_count > 0:
                             last_container = response_container.last
@@ -1972,9 +1977,7 @@ class PageController:
 
         try:
             # 等待响应容器出现
-            response_container_locator = self.page.locator(
-                RESPONSE_CONTAINER_SELECTOR
-            ).last
+            response_container_locator = self._locator(RESPONSE_CONTAINER_SELECTOR).last
             response_element_locator = response_container_locator.locator(
                 RESPONSE_TEXT_SELECTOR
             )
@@ -1984,9 +1987,9 @@ class PageController:
             await self._check_disconnect(check_client_disconnected, "获取响应 - 响应元素已附加")
 
             # 等待响应完成
-            submit_button_locator = self.page.locator(SUBMIT_BUTTON_SELECTOR)
-            edit_button_locator = self.page.locator(EDIT_MESSAGE_BUTTON_SELECTOR)
-            input_field_locator = self.page.locator(PROMPT_TEXTAREA_SELECTOR)
+            submit_button_locator = self._locator(SUBMIT_BUTTON_SELECTOR)
+            edit_button_locator = self._locator(EDIT_MESSAGE_BUTTON_SELECTOR)
+            input_field_locator = self._locator(PROMPT_TEXTAREA_SELECTOR)
 
             self.logger.info(f"[{self.req_id}] 等待响应完成...")
             completion_detected = await _wait_for_response_completion(
@@ -33,6 +33,7 @@ SAVED_AUTH_DIR = os.path.join(AUTH_PROFILES_DIR, "saved")
 
 DEFAULT_FASTAPI_PORT = int(os.environ.get('DEFAULT_FASTAPI_PORT', '2048'))
 DEFAULT_CAMOUFOX_PORT_GUI = int(os.environ.get('DEFAULT_CAMOUFOX_PORT', '9222'))  # 与 launch_camoufox.py 中的 DEFAULT_CAMOUFOX_PORT 一致
+OUTPUT_AREA_MAX_LINES = 2000  # 日志输出区域最多保留的行数，超出后丢弃最早的行
 
 managed_process_info: Dict[str, Any] = {
     "popen": None,
@@ -327,6 +328,16 @@ def get_text(key: str, **kwargs) -> str:
         text_template = LANG_TEXTS[key].get('en', f"<{key}_MISSING_{current_language}>")
     return text_template.format(**kwargs) if kwargs else text_template
 
+def append_to_output_area(output_area_widget, text: str):
+    """向日志输出区域追加文本，并只保留最近 OUTPUT_AREA_MAX_LINES 行，避免长时间运行时无限增长"""
+    output_area_widget.config(state=tk.NORMAL)
+    output_area_widget.insert(tk.END, text)
+    line_count = int(output_area_widget.index('end-1c').split('.')[0])
+    if line_count > OUTPUT_AREA_MAX_LINES:
+        output_area_widget.delete('1.0', f"{line_count - OUTPUT_AREA_MAX_LINES}.0")
+    output_area_widget.see(tk.END)
+    output_area_widget.config(state=tk.DISABLED)
+
 def update_status_bar(message_key: str, **kwargs):
     message = get_text(message_key, **kwargs)
 
@@ -339,11 +350,7 @@ def update_status_bar(message_key: str, **kwargs):
         if managed_process_info.get("output_area"):
             # The 'message' variable is captured from the outer scope (closure)
             if root_widget: # Ensure root_widget is still valid
-                output_area_widget = managed_process_info["output_area"]
-                output_area_widget.config(state=tk.NORMAL)
-                output_area_widget.insert(tk.END, f"[STATUS] {message}\n")
-                output_area_widget.see(tk.END)
-                output_area_widget.config(state=tk.DISABLED)
+                append_to_output_area(managed_process_info["output_area"], f"[STATUS] {message}\n")
 
     if root_widget:
         root_widget.after_idle(_perform_gui_updates)
@@ -357,6 +364,17 @@ def is_port_in_use(port: int) -> bool:
         except OSError: return True
         except Exception: return True
 
+def wait_for_ports_release(ports: List[int], timeout: float = 2.0, interval: float = 0.1) -> bool:
+    """Poll until none of the ports is in use or the timeout expires; returns True if all are free."""
+    deadline = time.monotonic() + timeout
+    pending = [port for port in ports if is_port_in_use(port)]
+    while pending:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+        pending = [port for port in pending if is_port_in_use(port)]
+    return True
+
 def get_process_name_by_pid(pid: int) -> str:
     system = platform.system()
     name = get_text("unknown_process_name_placeholder")
@@ -369,6 +387,13 @@ def get_process_name_by_pid(pid: int) -> str:
                 parts = process.stdout.strip().split('","')
                 if len(parts) > 0: name = parts[0].strip('"')
         elif system == "Linux":
+            # Read the name straight from /proc instead of spawning ps for every PID
+            try:
+                with open(f"/proc/{pid}/comm", "r") as comm_file:
+                    comm = comm_file.read().strip()
+                if comm: return comm
+            except OSError:
+                pass
             cmd_args = ["ps", "-p", str(pid), "-o", "comm="]
             process = subprocess.run(cmd_args, capture_output=True, text=True, check=True, timeout=3)
             if process.stdout.strip(): name = process.stdout.strip()
@@ -376,8 +401,6 @@ def get_process_name_by_pid(pid: int) -> str:
             cmd_args = ["ps", "-p", str(pid), "-o", "comm="]
             process = subprocess.run(cmd_args, capture_output=True, text=True, check=True, timeout=3)
             raw_path = process.stdout.strip() if process.stdout.strip() else ""
-            cmd_args = ["ps", "-p", str(pid), "-o", "command="]
-            process = subprocess.run(cmd_args, capture_output=True, text=True, check=True, timeout=3)
             if raw_path:
                 base_name = os.path.basename(raw_path)
                 name = f"{base_name} ({raw_path})"
@@ -387,18 +410,83 @@ def get_process_name_by_pid(pid: int) -> str:
         pass
     return name
 
-def find_processes_on_port(port: int) -> List[Dict[str, Any]]:
-    process_details = []
-    pids_only: List[int] = []
+def _find_listener_pids_from_proc(ports: List[int]) -> Optional[Dict[int, List[int]]]:
+    """
+    Linux only: map listening ports to PIDs by reading /proc/net/tcp{,6} and /proc/<pid>/fd,
+    without spawning lsof. Returns None if any matching socket's owner could not be resolved
+    (e.g. it belongs to another user's process), so the caller can fall back to lsof.
+    """
+    wanted = set(ports)
+    port_by_socket_link: Dict[str, int] = {}
+    for table_path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table_path, "r") as table:
+                next(table, None)  # header line
+                for line in table:
+                    parts = line.split()
+                    # parts[1] = local "ADDR:PORT" (hex), parts[3] = state (0A = LISTEN), parts[9] = inode
+                    if len(parts) < 10 or parts[3] != "0A":
+                        continue
+                    local_port = int(parts[1].rsplit(":", 1)[1], 16)
+                    if local_port in wanted and parts[9] != "0":
+                        port_by_socket_link[f"socket:[{parts[9]}]"] = local_port
+        except FileNotFoundError:
+            continue  # tcp6 is absent when IPv6 is disabled
+        except (OSError, ValueError):
+            return None
+    pids_by_port: Dict[int, List[int]] = {port: [] for port in ports}
+    if not port_by_socket_link:
+        return pids_by_port
+    unresolved = set(port_by_socket_link)
+    try:
+        with os.scandir("/proc") as proc_entries:
+            for proc_entry in proc_entries:
+                if not proc_entry.name.isdigit():
+                    continue
+                try:
+                    with os.scandir(f"/proc/{proc_entry.name}/fd") as fd_entries:
+                        for fd_entry in fd_entries:
+                            try:
+                                link_target = os.readlink(fd_entry.path)
+                            except OSError:
+                                continue
+                            matched_port = port_by_socket_link.get(link_target)
+                            if matched_port is not None:
+                                pid_val = int(proc_entry.name)
+                                if pid_val not in pids_by_port[matched_port]:
+                                    pids_by_port[matched_port].append(pid_val)
+                                unresolved.discard(link_target)
+                except OSError:
+                    continue  # process exited or fd dir not readable
+    except OSError:
+        return None
+    return None if unresolved else pids_by_port
+
+def find_processes_on_ports(ports: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """一次 lsof/netstat 调用查询多个端口上的监听进程，返回 {端口: [{"pid", "name"}, ...]}。"""
+    pids_by_port: Dict[int, List[int]] = {port: [] for port in ports}
+    if not pids_by_port:
+        return {}
     system = platform.system()
-    command_pid = ""
     try:
-        if system == "Linux" or system == "Darwin":
-            command_pid = f"lsof -ti tcp:{port} -sTCP:LISTEN"
-            process = subprocess.Popen(command_pid, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, universal_newlines=True, close_fds=True)
-            stdout_pid, _ = process.communicate(timeout=5)
-            if process.returncode == 0 and stdout_pid:
-                pids_only = [int(p) for p in stdout_pid.strip().splitlines() if p.isdigit()]
+        proc_pids = _find_listener_pids_from_proc(list(pids_by_port)) if system == "Linux" else None
+        if proc_pids is not None:
+            pids_by_port = proc_pids
+        elif system == "Linux" or system == "Darwin":
+            # 多个 -i 条件为"或"关系；-F pn 输出 p<pid> / n<地址:端口> 行，便于按端口归类
+            cmd_args = ["lsof", "-nP", "-sTCP:LISTEN", "-F", "pn"] + [f"-iTCP:{port}" for port in pids_by_port]
+            process = subprocess.run(cmd_args, capture_output=True, text=True, timeout=5, close_fds=True)
+            # 只要有一个端口无人监听 lsof 就返回 1，但其余端口的结果仍然有效
+            current_pid = None
+            for line in process.stdout.splitlines():
+                if line.startswith("p") and line[1:].isdigit():
+                    current_pid = int(line[1:])
+                elif line.startswith("n") and current_pid is not None:
+                    port_str = line.rsplit(":", 1)[-1]
+                    if port_str.isdigit():
+                        port_pids = pids_by_port.get(int(port_str))
+                        if port_pids is not None and current_pid not in port_pids:
+                            port_pids.append(current_pid)
         elif system == "Windows":
             command_pid = 'netstat -ano -p TCP'
             process = subprocess.Popen(command_pid, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
@@ -415,19 +503,44 @@ def find_processes_on_port(port: int) -> List[Dict[str, Any]]:
                             if last_colon_idx == -1:
                                 continue
                             extracted_port_str = local_address_full[last_colon_idx+1:]
-                            if extracted_port_str.isdigit() and int(extracted_port_str) == port:
+                            if extracted_port_str.isdigit():
+                                port_pids = pids_by_port.get(int(extracted_port_str))
                                 pid_str = parts[4]
-                                if pid_str.isdigit():
-                                    pids_only.append(int(pid_str))
+                                if port_pids is not None and pid_str.isdigit() and int(pid_str) not in port_pids:
+                                    port_pids.append(int(pid_str))
                         except (ValueError, IndexError):
                             continue
-                pids_only = list(set(pids_only))
     except Exception:
         pass
-    for pid_val in pids_only:
-        name = get_process_name_by_pid(pid_val)
-        process_details.append({"pid": pid_val, "name": name})
-    return process_details
+    names_by_pid: Dict[int, str] = {}
+    processes_by_port: Dict[int, List[Dict[str, Any]]] = {}
+    for port, pids in pids_by_port.items():
+        for pid_val in pids:
+            if pid_val not in names_by_pid:
+                names_by_pid[pid_val] = get_process_name_by_pid(pid_val)
+        processes_by_port[port] = [{"pid": pid_val, "name": names_by_pid[pid_val]} for pid_val in pids]
+    return processes_by_port
+
+def find_processes_on_port(port: int) -> List[Dict[str, Any]]:
+    return find_processes_on_ports([port]).get(port, [])
+
+def _wait_for_pid_exit(pid: int, timeout: float, initial_delay: float = 0.02, max_delay: float = 0.2) -> bool:
+    """Poll with exponential backoff until the PID is gone or the timeout expires (POSIX only); returns True once it has exited."""
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # e.g. PermissionError: the process exists but we may not signal it
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.7, max_delay)
 
 def kill_process_pid(pid: int) -> bool:
     system = platform.system()
@@ -438,7 +551,7 @@ def kill_process_pid(pid: int) -> bool:
             # 1. Attempt SIGTERM (best effort)
             logger.debug(f"Sending SIGTERM to PID {pid}")
             subprocess.run(["kill", "-TERM", str(pid)], capture_output=True, text=True, timeout=3) # check=False
-            time.sleep(0.5)
+            _wait_for_pid_exit(pid, timeout=0.5)  # returns as soon as the process is gone instead of always sleeping 0.5s
 
             # 2. Check if process is gone (or if we lack permission to check)
             try:
@@ -452,7 +565,7 @@ def kill_process_pid(pid: int) -> bool:
                 subprocess.run(["kill", "-KILL", str(pid)], check=True, capture_output=True, text=True, timeout=3) # Raises on perm error for SIGKILL
 
                 # 4. Verify with kill -0 again that it's gone
-                time.sleep(0.1)
+                _wait_for_pid_exit(pid, timeout=0.1)
                 logger.debug(f"Verifying PID {pid} with kill -0 after SIGKILL attempt")
                 try:
                     subprocess.run(["kill", "-0", str(pid)], check=True, capture_output=True, text=True, timeout=1)
@@ -577,8 +690,8 @@ def check_all_required_ports(ports_to_check: List[Tuple[int, str]]) -> bool:
                             logger.info(f"Port Check Cleanup: User declined admin kill for PID {pid} ({name}).")
                         pids_processed_this_cycle.add(pid) # Mark as processed even if admin declined/failed, to avoid re-prompting in this cycle
 
-        logger.info("Port Check Cleanup: Waiting for 2 seconds for processes to terminate...")
-        time.sleep(2)
+        logger.info("Port Check Cleanup: Waiting up to 2 seconds for the ports to be released...")
+        wait_for_ports_release([info['port'] for info in occupied_ports_info], timeout=2.0)
 
         still_occupied_after_cleanup = False
         for info in occupied_ports_info: # Re-check all originally occupied ports
@@ -784,12 +897,8 @@ def enqueue_stream_output(stream, stream_name_prefix):
             line = line_bytes.decode(sys.stdout.encoding or 'utf-8', errors='replace')
             if managed_process_info.get("output_area") and root_widget:
                 def _update_stream_output(line_to_insert):
-                    current_line = line_to_insert
                     if managed_process_info.get("output_area"):
-                        managed_process_info["output_area"].config(state=tk.NORMAL)
-                        managed_process_info["output_area"].insert(tk.END, current_line)
-                        managed_process_info["output_area"].see(tk.END)
-                        managed_process_info["output_area"].config(state=tk.DISABLED)
+                        append_to_output_area(managed_process_info["output_area"], line_to_insert)
                 root_widget.after_idle(_update_stream_output, f"[{stream_name_prefix}] {line}")
             else: print(f"[{stream_name_prefix}] {line.strip()}", flush=True)
     except ValueError: pass
@@ -899,9 +1008,12 @@ def save_config():
         "proxy_enabled": proxy_enabled_var.get()
     }
     try:
-        with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-            logger.info(f"成功保存配置到: {CONFIG_FILE_PATH}")
+        # 先写临时文件再原子替换，进程中途被杀时不会留下截断的配置文件
+        tmp_path = f"{CONFIG_FILE_PATH}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(config, ensure_ascii=False, indent=2))
+        os.replace(tmp_path, CONFIG_FILE_PATH)
+        logger.info(f"成功保存配置到: {CONFIG_FILE_PATH}")
     except Exception as e:
         logger.error(f"保存配置失败: {e}")
 
@@ -1650,14 +1762,13 @@ def query_port_and_display_pids_gui():
         pid_listbox_widget.delete(0, tk.END)
         pid_list_lbl_frame_ref.config(text=get_text("pids_on_multiple_ports_label")) # Update title
 
-        found_any_process = False
+        processes_by_port = find_processes_on_ports([p["port"] for p in ports_to_query_info])
         for port_info in ports_to_query_info:
             current_port = port_info["port"]
             port_type_name = port_info["type_name"]
 
-            processes_on_current_port = find_processes_on_port(current_port)
+            processes_on_current_port = processes_by_port.get(current_port, [])
             if processes_on_current_port:
-                found_any_process = True
                 for proc_info in processes_on_current_port:
                     pid_display_info = f"{proc_info['pid']} - {proc_info['name']}"
                     display_text = get_text("port_query_result_format",
@@ -1670,26 +1781,24 @@ def query_port_and_display_pids_gui():
                                         port_type=port_type_name,
                                         port_num=current_port)
                 pid_listbox_widget.insert(tk.END, display_text)
-
-        if not found_any_process and not any(find_processes_on_port(p["port"]) for p in ports_to_query_info): # Recheck if all are empty
-             # If after checking all, still no processes, we can add a general "no pids found on queried ports"
-             # but the per-port "not in use" message is usually clearer.
-             pass # Individual messages already cover this.
     else:
         logger.error("pid_listbox_widget or pid_list_lbl_frame_ref is None in query_port_and_display_pids_gui")
 
-def _perform_proxy_test_single(proxy_address: str, test_url: str, timeout: int = 15) -> Tuple[bool, str, int]:
+def _perform_proxy_test_single(proxy_address: str, test_url: str, timeout: int = 15,
+                               session: Optional[requests.Session] = None) -> Tuple[bool, str, int]:
     """
     单次代理测试尝试
+    传入 session 时复用其连接池，重试之间可保持与代理的 keep-alive 连接。
     Returns (success_status, message_or_error_string, status_code).
     """
     proxies = {
         "http": proxy_address,
         "https": proxy_address,
     }
+    http = session if session is not None else requests
     try:
         logger.info(f"Testing proxy {proxy_address} with URL {test_url} (timeout: {timeout}s)")
-        response = requests.get(test_url, proxies=proxies, timeout=timeout, allow_redirects=True)
+        response = http.get(test_url, proxies=proxies, timeout=timeout, allow_redirects=True)
         status_code = response.status_code
 
         # 检查HTTP状态码
@@ -1731,11 +1840,35 @@ def _perform_proxy_test_single(proxy_address: str, test_url: str, timeout: int =
         logger.error(f"Unexpected error during proxy test to {test_url} via {proxy_address}: {e}", exc_info=True)
         return False, f"Unexpected error: {e}", 0
 
+def _is_proxy_port_reachable(proxy_address: str, timeout: float = 3.0) -> bool:
+    """
+    对代理本身做一次 TCP 连接探测。代理不可达时，后续每个 URL、每次重试都会白白等满请求超时，
+    先探测可以直接失败返回。地址无法解析出主机时返回 True，交由 HTTP 测试给出具体错误。
+    """
+    try:
+        parsed = urlparse(proxy_address)
+        host = parsed.hostname
+        default_ports = {"http": 80, "https": 443, "socks4": 1080, "socks5": 1080, "socks5h": 1080}
+        port = parsed.port or default_ports.get((parsed.scheme or "").lower(), 80)
+    except ValueError:
+        return True
+    if not host:
+        return True
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError as e:
+        logger.warning(f"Proxy {proxy_address} is not accepting TCP connections ({host}:{port}): {e}")
+        return False
+
 def _perform_proxy_test(proxy_address: str, test_url: str) -> Tuple[bool, str]:
     """
     增强的代理测试函数，包含重试机制和备用URL
     Returns (success_status, message_or_error_string).
     """
+    if not _is_proxy_port_reachable(proxy_address):
+        return False, get_text("proxy_test_all_failed")
+
     max_attempts = 3
     backup_url = LANG_TEXTS["proxy_test_url_backup"]
     urls_to_try = [test_url]
@@ -1744,36 +1877,38 @@ def _perform_proxy_test(proxy_address: str, test_url: str) -> Tuple[bool, str]:
     if test_url != backup_url:
         urls_to_try.append(backup_url)
 
-    for url_index, current_url in enumerate(urls_to_try):
-        if url_index > 0:
-            logger.info(f"Trying backup URL: {current_url}")
-            update_status_bar("proxy_test_backup_url")
-
-        for attempt in range(1, max_attempts + 1):
-            if attempt > 1:
-                logger.info(f"Retrying proxy test (attempt {attempt}/{max_attempts})")
-                update_status_bar("proxy_test_retrying", attempt=attempt, max_attempts=max_attempts)
-                time.sleep(2)  # 重试前等待2秒
-
-            success, error_msg, status_code = _perform_proxy_test_single(proxy_address, current_url)
-
-            if success:
-                return True, get_text("proxy_test_success", url=current_url)
-
-            # 如果是503错误或超时，值得重试
-            should_retry = (
-                status_code == 503 or
-                "timeout" in error_msg.lower() or
-                "temporarily unavailable" in error_msg.lower()
-            )
-
-            if not should_retry:
-                # 对于非临时性错误，不重试，直接尝试下一个URL
-                logger.info(f"Non-retryable error for {current_url}: {error_msg}")
-                break
-
-            if attempt == max_attempts:
-                logger.warning(f"All {max_attempts} attempts failed for {current_url}: {error_msg}")
+    # 所有尝试共用一个 Session，避免每次请求都重新建立到代理的 TCP 连接
+    with requests.Session() as session:
+        for url_index, current_url in enumerate(urls_to_try):
+            if url_index > 0:
+                logger.info(f"Trying backup URL: {current_url}")
+                update_status_bar("proxy_test_backup_url")
+
+            for attempt in range(1, max_attempts + 1):
+                if attempt > 1:
+                    logger.info(f"Retrying proxy test (attempt {attempt}/{max_attempts})")
+                    update_status_bar("proxy_test_retrying", attempt=attempt, max_attempts=max_attempts)
+                    time.sleep(2)  # 重试前等待2秒
+
+                success, error_msg, status_code = _perform_proxy_test_single(proxy_address, current_url, session=session)
+
+                if success:
+                    return True, get_text("proxy_test_success", url=current_url)
+
+                # 如果是503错误或超时，值得重试
+                should_retry = (
+                    status_code == 503 or
+                    "timeout" in error_msg.lower() or
+                    "temporarily unavailable" in error_msg.lower()
+                )
+
+                if not should_retry:
+                    # 对于非临时性错误，不重试，直接尝试下一个URL
+                    logger.info(f"Non-retryable error for {current_url}: {error_msg}")
+                    break
+
+                if attempt == max_attempts:
+                    logger.warning(f"All {max_attempts} attempts failed for {current_url}: {error_msg}")
 
     # 所有URL和重试都失败了
     return False, get_text("proxy_test_all_failed")
@@ -26,7 +26,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import uvicorn
-from server import app # 从 server.py 导入 FastAPI app 对象
+# 内部 Camoufox 子进程 (--internal-launch-mode) 只负责启动浏览器，不会运行 FastAPI 应用；
+# 跳过导入 server 可省去整个应用及其依赖的加载时间（约 1 秒），缩短等待 WebSocket 端点的启动路径
+if any(arg.startswith('--internal-launch-mode') for arg in sys.argv):
+    app = None
+else:
+    from server import app # 从 server.py 导入 FastAPI app 对象
 # -----------------
 
 # 尝试导入 launch_server (用于内部启动模式，模拟 Camoufox 行为)
@@ -265,6 +270,15 @@ def is_port_in_use(port: int, host: str = "0.0.0.0") -> bool:
             logger.warning(f"检查端口 {port} (主机 {host}) 时发生未知错误: {e}")
             return True
 
+def wait_for_port_release(port: int, host: str = "0.0.0.0", timeout: float = 2.0, interval: float = 0.1) -> bool:
+    """轮询端口直到可用或超时，返回端口是否已释放（替代终止进程后的固定等待）。"""
+    deadline = time.monotonic() + timeout
+    while is_port_in_use(port, host=host):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
 def find_pids_on_port(port: int) -> list[int]:
     pids = []
     system_platform = platform.system()
@@ -781,8 +795,7 @@ if __name__ == "__main__":
                 if choice == 'y':
                     logger.info("     用户选择尝试终止进程...")
                     all_killed = all(kill_process_interactive(pid) for pid in pids_on_port)
-                    time.sleep(2)
-                    if not is_port_in_use(server_target_port, host=uvicorn_bind_host):
+                    if wait_for_port_release(server_target_port, host=uvicorn_bind_host, timeout=2.0):
                         logger.info(f"     ✅ 端口 {server_target_port} (主机 {uvicorn_bind_host}) 现在可用。")
                         port_is_available = True
                     else:
@@ -978,8 +991,11 @@ if __name__ == "__main__":
             except queue.Empty:
                 continue
 
-        if camoufox_stdout_reader.is_alive(): camoufox_stdout_reader.join(timeout=1.0)
-        if camoufox_stderr_reader.is_alive(): camoufox_stderr_reader.join(timeout=1.0)
+        # 成功捕获端点时 Camoufox 仍在运行，读取线程不会结束，join 只会白等 2 秒；
+        # 读取线程为 daemon，需继续排空管道，因此仅在未捕获到端点时才等待其收尾
+        if not captured_ws_endpoint:
+            if camoufox_stdout_reader.is_alive(): camoufox_stdout_reader.join(timeout=1.0)
+            if camoufox_stderr_reader.is_alive(): camoufox_stderr_reader.join(timeout=1.0)
 
         if not captured_ws_endpoint and (camoufox_proc and camoufox_proc.poll() is None):
             logger.error(f"  ❌ 未能在 {ENDPOINT_CAPTURE_TIMEOUT} 秒内从 Camoufox 内部进程 (PID: {camoufox_proc.pid}) 捕获到 WebSocket 端点。")
@@ -1134,7 +1150,9 @@ if __name__ == "__main__":
                     new_files = current_files - initial_files
                     if new_files:
                         logger.info(f"检测到新的已保存认证文件: {', '.join(new_files)}。将在 3 秒后触发关闭...")
-                        time.sleep(3)
+                        # 用事件等待代替 sleep：服务器若已先行退出，finally 中的 join 不必再等满 3 秒
+                        if stop_watcher.wait(3):
+                            break
                         server.should_exit = True
                         logger.info("已发送关闭信号给 Uvicorn 服务器。")
                         break
@@ -1,5 +1,5 @@
 import argparse # 新增导入
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import requests
 import time
 import uuid
@@ -70,6 +70,21 @@ API_URL = "" # 将在 main 函数中根据参数设置
 DEFAULT_MAIN_SERVER_PORT = 2048
 # 请替换为你的 API 密钥（请勿公开分享）
 API_KEY = "123456"
+# 转发请求超时 (秒)：(连接超时, 读取超时)。只限制连接阶段，主服务器不可达时快速失败；
+# 读取不设上限：非流式转发要等完整回复，主服务器自身的完成超时 (可由 RESPONSE_COMPLETION_TIMEOUT 配置)
+# 加上排队等待时间都可能很长，由主服务器负责超时
+API_REQUEST_TIMEOUT = (10, None)
+
+# 所有转发共用一个模块级 requests.Session：Werkzeug 线程模式为每个客户端连接新建线程，
+# 按线程隔离的 Session 几乎无法复用连接；urllib3 连接池本身线程安全，转发请求也不依赖 Cookie 状态，
+# 因此共享即可对主服务器保持 keep-alive 连接，避免每次转发都重新建立 TCP 连接
+_http_session = requests.Session()
+
+def get_http_session() -> requests.Session:
+    return _http_session
+
+# /api/tags 响应体缓存：ENABLED_MODELS 在运行期间不变，首次请求时序列化一次，之后直接复用
+_tags_response_cache: Dict[str, Any] = {"body": None, "names": None}
 
 # 模拟 Ollama 聊天响应数据库
 OLLAMA_MOCK_RESPONSES = {
@@ -88,6 +103,9 @@ def root_endpoint():
 def tags_endpoint():
     """模拟 Ollama 的 /api/tags 端点，动态生成启用模型列表"""
     logger.info("收到 /api/tags 请求")
+    if _tags_response_cache["body"] is not None:
+        logger.info(f"返回 {len(_tags_response_cache['names'])} 个模型: {_tags_response_cache['names']}")
+        return Response(_tags_response_cache["body"], status=200, mimetype="application/json")
     models = []
     for model_name in ENABLED_MODELS:
         # 推导 family：从模型名称提取前缀（如 "gpt-4o" -> "gpt"）
@@ -126,8 +144,10 @@ def tags_endpoint():
                 "quantization_level": quantization_level
             }
         })
-    logger.info(f"返回 {len(models)} 个模型: {[m['name'] for m in models]}")
-    return jsonify({"models": models}), 200
+    _tags_response_cache["names"] = [m['name'] for m in models]
+    _tags_response_cache["body"] = json.dumps({"models": models}, separators=(",", ":")).encode("utf-8")
+    logger.info(f"返回 {len(models)} 个模型: {_tags_response_cache['names']}")
+    return Response(_tags_response_cache["body"], status=200, mimetype="application/json")
 
 def generate_ollama_mock_response(prompt: str, model: str) -> Dict[str, Any]:
     """生成模拟的 Ollama 聊天响应，符合 /api/chat 格式"""
@@ -244,7 +264,7 @@ def ollama_chat_endpoint():
 
         try:
             logger.info(f"转发请求到API: {API_URL}")
-            response = requests.post(API_URL, json=api_request, headers=headers, timeout=300000)
+            response = get_http_session().post(API_URL, json=api_request, headers=headers, timeout=API_REQUEST_TIMEOUT)
             response.raise_for_status()
             api_response = response.json()
             ollama_response = convert_api_to_ollama_response(api_response, model)
@@ -295,7 +315,7 @@ def api_chat_endpoint():
 
         try:
             logger.info(f"转发请求到API: {API_URL}")
-            response = requests.post(API_URL, json=data, headers=headers, timeout=300000)
+            response = get_http_session().post(API_URL, json=data, headers=headers, timeout=API_REQUEST_TIMEOUT)
             response.raise_for_status()
             api_response = response.json()
             ollama_response = convert_api_to_ollama_response(api_response, model)
@@ -12,6 +12,7 @@ from .exceptions import ClientDisconnectedError
 
 # 日志工具类
 from .logging import (
+    CachedTimeFormatter,
     StreamToLogger,
     WebSocketConnectionManager,
     WebSocketLogHandler
@@ -29,6 +30,7 @@ __all__ = [
     'ClientDisconnectedError',
     
     # 日志工具
+    'CachedTimeFormatter',
     'StreamToLogger',
     'WebSocketConnectionManager',
     'WebSocketLogHandler'
@@ -3,6 +3,7 @@ import datetime
 import json
 import logging
 import sys
+import time
 from typing import Dict
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -89,11 +90,38 @@ class WebSocketConnectionManager:
                  self.disconnect(client_id_to_remove)
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """asctime 按秒缓存的 Formatter：同一秒内的日志复用已格式化的时间前缀，只拼接毫秒，
+    避免每条记录（且每个处理器各一次）都调用 time.strftime。输出与 logging.Formatter 一致。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, prefix = self._cached_second
+        if cached_second != second:
+            prefix = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_second = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+
+
 class WebSocketLogHandler(logging.Handler):
     def __init__(self, manager: WebSocketConnectionManager):
         super().__init__()
         self.manager = manager
-        self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.formatter = CachedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s')
+        # 记录事件循环，以便工作线程 (如 asyncio.to_thread) 中产生的日志也能广播到 WebSocket
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+
+    def _schedule_broadcast(self, message: str):
+        self._loop.create_task(self.manager.broadcast(message))
 
     def emit(self, record: logging.LogRecord):
         if self.manager and self.manager.active_connections:
@@ -101,8 +129,12 @@ class WebSocketLogHandler(logging.Handler):
                 log_entry_str = self.format(record)
                 try:
                      current_loop = asyncio.get_running_loop()
+                     self._loop = current_loop
                      current_loop.create_task(self.manager.broadcast(log_entry_str))
                 except RuntimeError:
-                     pass
+                     # 非事件循环线程：线程安全地交回事件循环调度
+                     loop = self._loop
+                     if loop is not None and not loop.is_closed():
+                         loop.call_soon_threadsafe(self._schedule_broadcast, log_entry_str)
             except Exception as e:
                 print(f"WebSocketLogHandler 错误: 广播日志失败 - {e}", file=sys.__stderr__) 
\ No newline at end of file
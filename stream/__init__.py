@@ -1,7 +1,7 @@
-import asyncio
 import multiprocessing
 
 from stream import main
+from stream.utils import run_event_loop
 
 def start(*args, **kwargs):
     """
@@ -24,4 +24,4 @@ def start(*args, **kwargs):
         port = kwargs.get('port', None)
         proxy = kwargs.get('proxy', None)
 
-    asyncio.run(main.builtin(queue=queue, port=port, proxy=proxy))
\ No newline at end of file
+    run_event_loop(main.builtin(queue=queue, port=port, proxy=proxy))
\ No newline at end of file
@@ -1,11 +1,11 @@
 import argparse
-import asyncio
 import logging
 import multiprocessing
 import sys
 from pathlib import Path
 
 from stream.proxy_server import ProxyServer
+from stream.utils import run_event_loop
 
 def parse_args():
     """Parse command line arguments"""
@@ -102,4 +102,4 @@ async def builtin(queue: multiprocessing.Queue = None, port=None, proxy=None):
         sys.exit(1)
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    run_event_loop(main())
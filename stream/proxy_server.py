@@ -18,6 +18,10 @@ class ProxyServer:
         self.host = host
         self.port = port
         self.intercept_domains = intercept_domains or []
+        # Precomputed match tables: exact hosts as a set, wildcard suffixes
+        # (e.g. "*.example.com" -> ".example.com") as one tuple for str.endswith
+        self._intercept_exact = set(self.intercept_domains)
+        self._intercept_suffixes = tuple(d[1:] for d in self.intercept_domains if d.startswith("*."))
         self.upstream_proxy = upstream_proxy
         self.queue = queue
         
@@ -37,17 +41,11 @@ class ProxyServer:
         """
         Determine if the connection to the host should be intercepted
         """
-        if host in self.intercept_domains:
+        if host in self._intercept_exact:
             return True
 
-        # Wildcard match (e.g. *.example.com)
-        for d in self.intercept_domains:
-            if d.startswith("*."):
-                suffix = d[1:]  # Remove *
-                if host.endswith(suffix):
-                    return True
-
-        return False
+        # Wildcard match (e.g. *.example.com), all suffixes checked in a single call
+        return bool(self._intercept_suffixes) and host.endswith(self._intercept_suffixes)
 
     async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """
@@ -305,7 +303,9 @@ class ProxyServer:
                                 )
 
                                 if self.queue is not None:
-                                    self.queue.put(json.dumps(resp))
+                                    # Compact UTF-8 JSON: the cumulative body is re-sent on every chunk,
+                                    # so \uXXXX escapes and separator spaces add up quickly for CJK text
+                                    self.queue.put(json.dumps(resp, ensure_ascii=False, separators=(',', ':')))
                             except Exception as e:
                                 # --- FIX: Log the unused exception variable ---
                                 self.logger.error(f"Error during response interception: {e}")
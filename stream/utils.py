@@ -1,6 +1,21 @@
+import asyncio
 import logging
 from urllib.parse import urlparse
 
+def run_event_loop(coro):
+    """
+    Run the proxy's top-level coroutine, on uvloop when it is installed
+    (it is a dependency on non-Windows platforms), otherwise on the default asyncio loop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
 def is_generate_content_endpoint(url):
     """
     Check if the URL is a GenerateContent endpoint